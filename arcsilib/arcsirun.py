@@ -58,6 +58,16 @@ import arcsilib.arcsiutils
 from arcsilib.arcsiexception import ARCSIException
 from arcsilib.arcsisensor import ARCSIAbstractSensor
 
+# Maps (atmosphere profile mode, summer(1)/winter(2) flag) to the 6S
+# atmosphere profile name - avoids re-evaluating the nested branches for
+# every scene processed.
+_ATMOS_PROFILE_SEASON_LUT = {
+    (2, 1): "MidlatitudeSummer",
+    (2, 2): "MidlatitudeWinter",
+    (3, 1): "SubarcticSummer",
+    (3, 2): "SubarcticWinter",
+}
+
 
 class ARCSIParamsObj(object):
     def __init__(self):
@@ -390,20 +400,13 @@ def prepParametersObj(
             )
             if atmosProfileMode == 1:
                 paramsObj.atmosProfileOption = "Tropical"
-            elif atmosProfileMode == 2:
-                if summerWinter == 1:
-                    paramsObj.atmosProfileOption = "MidlatitudeSummer"
-                elif summerWinter == 2:
-                    paramsObj.atmosProfileOption = "MidlatitudeWinter"
-                else:
-                    raise ARCSIException("Not recognised as being summer or winter.")
-            elif atmosProfileMode == 3:
-                if summerWinter == 1:
-                    paramsObj.atmosProfileOption = "SubarcticSummer"
-                elif summerWinter == 2:
-                    paramsObj.atmosProfileOption = "SubarcticWinter"
-                else:
+            elif atmosProfileMode in (2, 3):
+                atmosProfileOption = _ATMOS_PROFILE_SEASON_LUT.get(
+                    (atmosProfileMode, summerWinter)
+                )
+                if atmosProfileOption is None:
                     raise ARCSIException("Not recognised as being summer or winter.")
+                paramsObj.atmosProfileOption = atmosProfileOption
             else:
                 raise ARCSIException(
                     "The atmosphere profile from the input image was not recognised."
@@ -157,14 +157,11 @@ class ARCSILandsatETMSensor(ARCSIAbstractSensor):
             for line in hFile:
                 line = line.strip()
                 if line:
-                    lineVals = line.split("=")
-                    if len(lineVals) == 2:
-                        if (lineVals[0].strip() != "GROUP") or (
-                            lineVals[0].strip() != "END_GROUP"
-                        ):
-                            headerParams[lineVals[0].strip()] = (
-                                lineVals[1].strip().replace('"', "")
-                            )
+                    headerKey, eqSep, headerVal = line.partition("=")
+                    if eqSep and ("=" not in headerVal):
+                        headerKey = headerKey.strip()
+                        if (headerKey != "GROUP") or (headerKey != "END_GROUP"):
+                            headerParams[headerKey] = headerVal.strip().replace('"', "")
             hFile.close()
             print("Extracting Header Values")
             # Get the sensor info.
@@ -320,7 +317,7 @@ class ARCSILandsatETMSensor(ARCSIAbstractSensor):
 
             # print("Lat: " + str(self.latCentre) + " Long: " + str(self.lonCentre))
 
-            metaFilenames = ARCSILandsatMetaUtils.getBandFilenames(headerParams, 8)
+            metaFilenames = ARCSILandsatMetaUtils.getBandFilenamesFast(headerParams, 8)
 
             filesDIR = os.path.dirname(inputHeader)
 
@@ -121,14 +121,11 @@ class ARCSILandsatMSSSensor(ARCSIAbstractSensor):
             for line in hFile:
                 line = line.strip()
                 if line:
-                    lineVals = line.split("=")
-                    if len(lineVals) == 2:
-                        if (lineVals[0].strip() != "GROUP") or (
-                            lineVals[0].strip() != "END_GROUP"
-                        ):
-                            headerParams[lineVals[0].strip()] = (
-                                lineVals[1].strip().replace('"', "")
-                            )
+                    headerKey, eqSep, headerVal = line.partition("=")
+                    if eqSep and ("=" not in headerVal):
+                        headerKey = headerKey.strip()
+                        if (headerKey != "GROUP") or (headerKey != "END_GROUP"):
+                            headerParams[headerKey] = headerVal.strip().replace('"', "")
             hFile.close()
             print("Extracting Header Values")
 
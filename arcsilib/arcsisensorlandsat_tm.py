@@ -144,14 +144,11 @@ class ARCSILandsatTMSensor(ARCSIAbstractSensor):
             for line in hFile:
                 line = line.strip()
                 if line:
-                    lineVals = line.split("=")
-                    if len(lineVals) == 2:
-                        if (lineVals[0].strip() != "GROUP") or (
-                            lineVals[0].strip() != "END_GROUP"
-                        ):
-                            headerParams[lineVals[0].strip()] = (
-                                lineVals[1].strip().replace('"', "")
-                            )
+                    headerKey, eqSep, headerVal = line.partition("=")
+                    if eqSep and ("=" not in headerVal):
+                        headerKey = headerKey.strip()
+                        if (headerKey != "GROUP") or (headerKey != "END_GROUP"):
+                            headerParams[headerKey] = headerVal.strip().replace('"', "")
             hFile.close()
             print("Extracting Header Values")
             # Get the sensor info.
@@ -309,7 +306,7 @@ class ARCSILandsatTMSensor(ARCSIAbstractSensor):
 
             # print("Lat: " + str(self.latCentre) + " Long: " + str(self.lonCentre))
 
-            metaFilenames = ARCSILandsatMetaUtils.getBandFilenames(headerParams, 7)
+            metaFilenames = ARCSILandsatMetaUtils.getBandFilenamesFast(headerParams, 7)
 
             filesDIR = os.path.dirname(inputHeader)
 
@@ -50,27 +50,38 @@ def ARCSIEnum(*sequential, **named):
 
 
 def readSpectralResponseFunc(inFile, seperator, ignoreLines, waveCol, respCol):
-    specResp = list()
+    """
+    Read a spectral response function file returning the wavelengths and
+    responses as a pair of contiguous 1D arrays (wvlens, respFunc).
+    """
     try:
-        specFile = open(inFile, "r")
-        lineCount = 0
-        for line in specFile:
-            if lineCount >= ignoreLines:
-                line = line.strip()
-                if line:
-                    lineVals = line.split(seperator)
-                    if (len(lineVals) <= waveCol) or (len(lineVals) <= respCol):
-                        raise ARCSIException("")
-                    waveVal = float(lineVals[waveCol].strip())
-                    respVal = float(lineVals[respCol].strip())
-                    specResp.append([waveVal, respVal])
-            lineCount += 1
-        specFile.close()
-    except ARCSIException as e:
-        raise e
-    except Exception as e:
-        raise e
-    return numpy.array(specResp)
+        specResp = numpy.loadtxt(
+            inFile,
+            delimiter=seperator,
+            skiprows=ignoreLines,
+            usecols=(waveCol, respCol),
+            comments=None,
+            ndmin=2,
+        )
+    except (ValueError, IndexError) as e:
+        raise ARCSIException(
+            "Could not parse the spectral response function file: {}".format(e)
+        )
+    return (
+        numpy.ascontiguousarray(specResp[:, 0]),
+        numpy.ascontiguousarray(specResp[:, 1]),
+    )
+
+
+def readSpectralResponseFuncAoS(inFile, seperator, ignoreLines, waveCol, respCol):
+    """
+    As readSpectralResponseFunc but returning the previous (N, 2) array of
+    [wavelength, response] rows for callers which index row-wise.
+    """
+    wvlens, respFunc = readSpectralResponseFunc(
+        inFile, seperator, ignoreLines, waveCol, respCol
+    )
+    return numpy.column_stack((wvlens, respFunc))
 
 
 def resampleSpectralResponseFunc(wvlens, respFunc, outSamp, sampleMethod):
@@ -99,6 +110,65 @@ def resampleSpectralResponseFunc(wvlens, respFunc, outSamp, sampleMethod):
     return oWVLens, oSpecResp
 
 
+def _arcsiJit(**kwargs):
+    """
+    Decorator for numeric helper functions which compiles with numba
+    (njit with an on-disk compile cache, so the compile cost is only paid
+    once per machine) where numba is installed and leaves the function as
+    pure Python where it is not.
+    """
+    try:
+        import numba
+    except ImportError:
+
+        def _noJit(func):
+            return func
+
+        return _noJit
+    kwargs.setdefault("cache", True)
+    return numba.njit(**kwargs)
+
+
+# numpy 2.0 renamed trapz to trapezoid; bind whichever this numpy has.
+_numpyTrapezoid = getattr(numpy, "trapezoid", getattr(numpy, "trapz", None))
+
+
+@_arcsiJit(fastmath=True)
+def _integrateSRF(wvlens, respFunc):
+    total = 0.0
+    for i in range(1, wvlens.shape[0]):
+        total += 0.5 * (respFunc[i] + respFunc[i - 1]) * (wvlens[i] - wvlens[i - 1])
+    return total
+
+
+def warmupJITFuncs():
+    """
+    Trigger compilation of the jitted helpers with tiny dummy inputs so the
+    one-off compile cost is not paid in the middle of scene processing.
+    A no-op when numba is not installed.
+    """
+    _integrateSRF(
+        numpy.array([0.0, 1.0], dtype=numpy.float64),
+        numpy.array([0.0, 1.0], dtype=numpy.float64),
+    )
+
+
+def integrateSpectralResponseFunc(wvlens, respFunc):
+    """
+    Integrate a spectral response function over wavelength using the
+    trapezium rule. Expects the two 1D arrays returned by
+    readSpectralResponseFunc. Compiled with numba where available,
+    falling back to numpy otherwise.
+    """
+    wvlens = numpy.ascontiguousarray(wvlens, dtype=numpy.float64)
+    respFunc = numpy.ascontiguousarray(respFunc, dtype=numpy.float64)
+    # numba dispatchers expose py_func; without numba _integrateSRF is
+    # the plain Python loop, so use the vectorised numpy version.
+    if hasattr(_integrateSRF, "py_func"):
+        return float(_integrateSRF(wvlens, respFunc))
+    return float(_numpyTrapezoid(respFunc, wvlens))
+
+
 def findMinimumElev(elev):
     elevVal = -550
     outElev = 0
@@ -143,6 +213,31 @@ def findMaximumAOT(aot):
     return aotVal
 
 
+# Pre-built metadata key pairs (new format, old format) so the per-scene
+# parsing functions do not rebuild the format strings on every call.
+_GEO_CORNER_KEYS = tuple(
+    (
+        "CORNER_{0}_{1}_PRODUCT".format(corner, axis),
+        "PRODUCT_{0}_CORNER_{1}".format(corner, axis),
+    )
+    for corner in ("UL", "UR", "LL", "LR")
+    for axis in ("LAT", "LON")
+)
+_PROJ_CORNER_KEYS = tuple(
+    (
+        "CORNER_{0}_PROJECTION_{1}_PRODUCT".format(corner, axis),
+        "PRODUCT_{0}_CORNER_MAP{1}".format(corner, axis),
+    )
+    for corner in ("UL", "UR", "LL", "LR")
+    for axis in ("X", "Y")
+)
+_BAND_FILENAME_KEYS = tuple(
+    ("FILE_NAME_BAND_{}".format(band), "BAND{}_FILE_NAME".format(band))
+    for band in range(1, 13)
+)
+_NEW_BAND_FILENAME_KEYS = tuple(newKey for newKey, oldKey in _BAND_FILENAME_KEYS)
+
+
 class ARCSILandsatMetaUtils(object):
     """
     A class with common functions for parsing Landsat
@@ -167,34 +262,11 @@ class ARCSILandsatMetaUtils(object):
 
         """
         outCornerCoords = []
-        geoVarList = [
-            ["UL", "LAT"],
-            ["UL", "LON"],
-            ["UR", "LAT"],
-            ["UR", "LON"],
-            ["LL", "LAT"],
-            ["LL", "LON"],
-            ["LR", "LAT"],
-            ["LR", "LON"],
-        ]
-
-        for geoItem in geoVarList:
-            try:
-                outCornerCoords.append(
-                    float(
-                        headerParams[
-                            "CORNER_{0}_{1}_PRODUCT".format(geoItem[0], geoItem[1])
-                        ]
-                    )
-                )
-            except KeyError:
-                outCornerCoords.append(
-                    float(
-                        headerParams[
-                            "PRODUCT_{0}_CORNER_{1}".format(geoItem[0], geoItem[1])
-                        ]
-                    )
-                )
+        for newKey, oldKey in _GEO_CORNER_KEYS:
+            cornerVal = headerParams.get(newKey)
+            if cornerVal is None:
+                cornerVal = headerParams[oldKey]
+            outCornerCoords.append(float(cornerVal))
 
         return outCornerCoords
 
@@ -216,38 +288,11 @@ class ARCSILandsatMetaUtils(object):
 
         """
         outCornerCoords = []
-        projectedVarList = [
-            ["UL", "X"],
-            ["UL", "Y"],
-            ["UR", "X"],
-            ["UR", "Y"],
-            ["LL", "X"],
-            ["LL", "Y"],
-            ["LR", "X"],
-            ["LR", "Y"],
-        ]
-
-        for projectedItem in projectedVarList:
-            try:
-                outCornerCoords.append(
-                    float(
-                        headerParams[
-                            "CORNER_{0}_PROJECTION_{1}_PRODUCT".format(
-                                projectedItem[0], projectedItem[1]
-                            )
-                        ]
-                    )
-                )
-            except KeyError:
-                outCornerCoords.append(
-                    float(
-                        headerParams[
-                            "PRODUCT_{0}_CORNER_MAP{1}".format(
-                                projectedItem[0], projectedItem[1]
-                            )
-                        ]
-                    )
-                )
+        for newKey, oldKey in _PROJ_CORNER_KEYS:
+            cornerVal = headerParams.get(newKey)
+            if cornerVal is None:
+                cornerVal = headerParams[oldKey]
+            outCornerCoords.append(float(cornerVal))
 
         return outCornerCoords
 
@@ -261,21 +306,31 @@ class ARCSILandsatMetaUtils(object):
         metaFilenames = []
 
         for i in range(1, nBands + 1):
-            try:
-                metaFilenames.append(headerParams["FILE_NAME_BAND_{}".format(i)])
-            except KeyError:
-                try:
-                    metaFilenames.append(headerParams["BAND{}_FILE_NAME".format(i)])
-                # For Landsat 7 ETM+ There are two band 6 files.
-                # Just set to 'None' here and fetch separately.
-                except Exception:
-                    if i == 6:
-                        metaFilenames.append(None)
-                    else:
-                        raise
+            newKey, oldKey = _BAND_FILENAME_KEYS[i - 1]
+            fileName = headerParams.get(newKey)
+            if fileName is None:
+                fileName = headerParams.get(oldKey)
+            if (fileName is None) and (i != 6):
+                raise KeyError(newKey)
+            # For Landsat 7 ETM+ There are two band 6 files.
+            # Just leave as 'None' here and fetch separately.
+            metaFilenames.append(fileName)
 
         return metaFilenames
 
+    @staticmethod
+    def getBandFilenamesFast(headerParams, nBands):
+        """
+        As getBandFilenames but specialised for the common case where all
+        the new format (FILE_NAME_BAND_i) keys are present, which reduces
+        the per-scene work to a flat list comprehension. Falls back to the
+        generic function for older format headers.
+        """
+        bandKeys = _NEW_BAND_FILENAME_KEYS[:nBands]
+        if all(bandKey in headerParams for bandKey in bandKeys):
+            return [headerParams[bandKey] for bandKey in bandKeys]
+        return ARCSILandsatMetaUtils.getBandFilenames(headerParams, nBands)
+
 
 class ARCSISensorFactory(object):
     def getSensorClassFromName(self, sensor, debugMode, inputImage):
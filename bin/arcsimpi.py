@@ -39,14 +39,14 @@ Module that contains the ARSCI Main class.
 ############################################################################
 
 import argparse
+import atexit
+import enum
+import functools
+import logging
 import os
+import stat
 import sys
-import time
 
-import rsgislib.tools.utils
-from mpi4py import MPI
-
-import arcsilib.arcsirun
 from arcsilib import (
     ARCSI_CLOUD_METHODS_LIST,
     ARCSI_COPYRIGHT_NAMES,
@@ -57,222 +57,518 @@ from arcsilib import (
     ARCSI_SUPPORT_EMAIL,
     ARCSI_VERSION,
     ARCSI_WEBSITE,
+    DEFAULT_ARCSI_AEROIMG_PATH,
+    DEFAULT_ARCSI_ATMOSIMG_PATH,
 )
 from arcsilib.arcsiexception import ARCSIException
-from arcsilib.arcsiutils import ARCSIEnum
 
 DEBUG = True
 
-# Initializations and preliminaries
-try:
-    # Define MPI message tags
-    mpiTags = ARCSIEnum("READY", "DONE", "EXIT", "START")
-    arcsiStages = ARCSIEnum("ARCSIPART1", "ARCSIPART2", "ARCSIPART3", "ARCSIPART4")
+logger = logging.getLogger("arcsimpi")
+
+# Options which can be answered without initialising MPI or importing the
+# heavy processing modules.
+HELP_ONLY_OPTS = {
+    "-h",
+    "--help",
+    "-v",
+    "--version",
+    "--sensorlist",
+    "--prodlist",
+    "--envvars",
+}
+
+
+class MpiTags(enum.IntEnum):
+    """MPI message tags."""
+
+    READY = 0
+    DONE = 1
+    EXIT = 2
+    START = 3
+
+
+class ArcsiStages(enum.IntEnum):
+    """The processing stages of the ARCSI pipeline."""
+
+    ARCSIPART1 = 0
+    ARCSIPART2 = 1
+    ARCSIPART3 = 2
+    ARCSIPART4 = 3
+    ARCSIPREP = 4
+
+
+mpiTags = MpiTags
+arcsiStages = ArcsiStages
+
+# Per-product processing requirements as (needAOD, needAODMinMax,
+# needTmp, needDEM). Products not listed have no extra requirements.
+# DOS only needs the temporary directory when the full (non simple)
+# method is used, which is handled at the lookup site.
+PROD_REQUIREMENTS = {
+    "DDVAOT": (False, True, True, True),
+    "SREF": (True, False, False, False),
+    "DOS": (False, False, True, False),
+    "CLOUDS": (False, False, True, False),
+    "DOSAOT": (False, True, True, True),
+    "DOSAOTSGL": (False, True, True, True),
+    "TOPOSHADOW": (False, False, True, True),
+}
+
+# AOT search arguments which can be defaulted from the environment,
+# as (args attribute, environment variable) pairs.
+AOT_ENV_DEFAULTS = (
+    ("minaot", "ARCSI_MIN_AOT"),
+    ("maxaot", "ARCSI_MAX_AOT"),
+    ("lowaot", "ARCSI_LOW_AOT"),
+    ("upaot", "ARCSI_UP_AOT"),
+)
+
+# Populated by initMPI() - left unset for the help-only fast path.
+MPI = None
+mpiComm = None
+mpiSize = 1
+mpiRank = 0
+mpiStatus = None
+mpiProcName = ""
 
-    mpiComm = MPI.COMM_WORLD  # get MPI communicator object
-    mpiSize = mpiComm.size  # total number of processes
-    mpiRank = mpiComm.Get_rank()  # get rank
-    mpiStatus = MPI.Status()  # get MPI status object
 
-    if DEBUG:
-        print(
-            f"DEBUG - Running on rank={mpiRank} out of size={mpiSize} on node={MPI.Get_processor_name()}"
-        )
+def helpOnlyInvocation():
+    """
+    Returns True where the command line only requests help / listing
+    output, so MPI initialisation and the heavy geospatial imports can
+    be skipped entirely.
+    """
+    return (len(sys.argv) == 1) or (not HELP_ONLY_OPTS.isdisjoint(sys.argv))
+
+
+def launcherRank():
+    """
+    Best-effort rank of this process read from the MPI launcher
+    environment, available without initialising MPI. Only used on the
+    help-only fast path so just rank 0 prints when run under mpirun.
+    """
+    for envVarName in (
+        "OMPI_COMM_WORLD_RANK",
+        "PMI_RANK",
+        "PMIX_RANK",
+        "SLURM_PROCID",
+    ):
+        envVal = os.environ.get(envVarName)
+        if envVal is not None:
+            return int(envVal)
+    return 0
+
+
+@functools.lru_cache(maxsize=1)
+def _getARCSIRun():
+    """
+    Import arcsilib.arcsirun on first use. The import pulls in the heavy
+    geospatial processing stack, so it is deferred until a rank actually
+    has work to do rather than being paid by every rank at startup.
+    """
+    import arcsilib.arcsirun
 
-except Exception as error:
-    print(f"ERROR. {error}")
+    return arcsilib.arcsirun
 
 
-if (__name__ == "__main__") and (mpiRank == 0):
+# Snapshot of the process environment taken once at import; all the
+# ARCSI_* fallbacks read from this rather than issuing repeated getenv
+# calls through rsgislib.
+_ENVIRON_SNAPSHOT = dict(os.environ)
+
+
+def _getEnvVar(envVarName):
     """
-    The command line user interface to ARCSI
+    Look up an ARCSI_* environment variable from the snapshot taken at
+    import, returning None where it is not set.
     """
-    print(
-        "ARCSI "
-        + ARCSI_VERSION
-        + " Copyright (C) "
-        + ARCSI_COPYRIGHT_YEAR
-        + " "
-        + ARCSI_COPYRIGHT_NAMES
+    return _ENVIRON_SNAPSHOT.get(envVarName)
+
+
+def _buildPrepFunc(args, atmosOZoneWaterSpecified, aeroComponentsSpecified):
+    """
+    Bind all the per-run arguments of prepParametersObj once, returning
+    a callable which takes just the input header. The bound callable is
+    reused for every granule rather than pushing ~50 arguments onto the
+    stack per call.
+    """
+    return functools.partial(
+        _getARCSIRun().prepParametersObj,
+        inputImage=None,
+        cloudMaskUsrImg=None,
+        sensorStr=args.sensor,
+        inWKTFile=args.inwkt,
+        outFormat=args.format,
+        outFilePath=args.outpath,
+        outBaseName=args.outbasename,
+        outWKTFile=args.outwkt,
+        outProj4File=args.outproj4,
+        projAbbv=args.projabbv,
+        xPxlResUsr=args.ximgres,
+        yPxlResUsr=args.yimgres,
+        productsStr=args.prods,
+        calcStatsPy=args.stats,
+        aeroProfileOption=args.aeropro,
+        atmosProfileOption=args.atmospro,
+        aeroProfileOptionImg=args.aeroimg,
+        atmosProfileOptionImg=args.atmosimg,
+        grdReflOption=args.grdrefl,
+        surfaceAltitude=args.surfacealtitude,
+        atmosOZoneVal=args.atmosozone,
+        atmosWaterVal=args.atmoswater,
+        atmosOZoneWaterSpecified=atmosOZoneWaterSpecified,
+        aeroWaterVal=args.aerowater,
+        aeroDustVal=args.aerodust,
+        aeroOceanicVal=args.aerooceanic,
+        aeroSootVal=args.aerosoot,
+        aeroComponentsSpecified=aeroComponentsSpecified,
+        aotVal=args.aot,
+        visVal=args.vis,
+        tmpPath=args.tmpath,
+        minAOT=args.minaot,
+        maxAOT=args.maxaot,
+        lowAOT=args.lowaot,
+        upAOT=args.upaot,
+        demFile=args.dem,
+        demNoDataUsrVal=args.demnodata,
+        aotFile=args.aotfile,
+        globalDOS=(not args.localdos),
+        dosOutRefl=args.dosout,
+        simpleDOS=args.simpledos,
+        debugMode=args.debug,
+        scaleFactor=args.scalefac,
+        interpAlgor=args.interp,
+        interpAlgorResample=args.interpresamp,
+        initClearSkyRegionDist=args.cs_initdist,
+        initClearSkyRegionMinSize=args.cs_initminsize,
+        finalClearSkyRegionDist=args.cs_finaldist,
+        clearSkyMorphSize=args.cs_morphop,
+        fullImgOuts=args.fullimgouts,
+        checkOutputs=args.checkouts,
+        resample2LowResImg=args.resample2lowres,
+        fileEnding2Keep=args.keepfileends,
+        cloud_methods=args.cloudmethods,
+        flat_out_dir=args.flatoutdir,
     )
-    print("This program comes with ABSOLUTELY NO WARRANTY.")
-    print("This is free software, and you are welcome to redistribute it")
-    print("under certain conditions; See website (" + ARCSI_WEBSITE + ").")
-    print("Bugs are to be reported to " + ARCSI_SUPPORT_EMAIL + ".\n")
-
-    if len(sys.argv) == 1:
-        print("arcsimpi.py [options]")
-        print("help : arcsimpi.py --help")
-        print("  or : arcsimpi.py -h")
-        print("")
-        print(
-            "Example: mpirun -np 2 arcsimpi.py -s sen2 -p TOA SHARP METADATA -f KEA --stats \\"
+
+
+def _statPath(pathName):
+    """
+    Single stat probe of a path, returning the os.stat_result or None
+    where the path does not exist. One round trip to the (often shared)
+    filesystem instead of separate exists and isdir checks.
+    """
+    try:
+        return os.stat(pathName)
+    except OSError:
+        return None
+
+
+def _finalizeMPI():
+    """
+    Finalise MPI at interpreter exit where it is still initialised -
+    registered by initMPI so error exits do not leave the MPI runtime
+    hanging.
+    """
+    if (MPI is not None) and MPI.Is_initialized() and (not MPI.Is_finalized()):
+        MPI.Finalize()
+
+
+def abortMPIJob():
+    """
+    Abort the whole MPI job after a fatal error on rank 0. A plain
+    sys.exit here would leave the worker ranks blocked in the args
+    broadcast waiting for a message which will never come.
+    """
+    if mpiComm is not None:
+        mpiComm.Abort(1)
+    sys.exit(1)
+
+
+def initMPI():
+    """
+    Initialise MPI - deferred to a function so the help-only fast path
+    never pays the mpi4py import and MPI_Init cost.
+    """
+    global MPI, mpiComm, mpiSize, mpiRank, mpiStatus, mpiProcName
+    try:
+        from mpi4py import MPI as mpiMod
+
+        MPI = mpiMod
+        mpiComm = MPI.COMM_WORLD  # get MPI communicator object
+        mpiSize = mpiComm.size  # total number of processes
+        mpiRank = mpiComm.Get_rank()  # get rank
+        mpiStatus = MPI.Status()  # get MPI status object
+        mpiProcName = MPI.Get_processor_name()  # constant per rank
+        # every worker starts idle; the master tracks idleness from
+        # DONE receipts so no READY handshake is required.
+        idleWorkers.update(range(1, mpiSize))
+        atexit.register(_finalizeMPI)
+    except Exception as error:
+        print(f"Error: Could not initialise MPI: {error}", file=sys.stderr)
+        sys.exit(1)
+
+
+# Workers with no task in flight. Maintained by the master: seeded with
+# every worker rank at MPI initialisation and updated from DONE receipts,
+# so workers never send a READY handshake.
+idleWorkers = set()
+
+
+def runStageMaster(stage, stageName, paramsLst):
+    """
+    Dispatch a single processing stage from the master rank. Tasks are
+    pushed to idle workers and a worker is marked idle again when its
+    DONE reply arrives, so slow scenes do not hold up idle workers and
+    the number of granules is independent of the number of MPI ranks.
+    The processed parameter objects are returned in their original
+    granule order.
+    """
+    nTasks = len(paramsLst)
+    if nTasks == 0:
+        return []
+    paramsLstTmp = [None] * nTasks
+    taskIdx = 0
+    completedTasks = 0
+
+    # seed every idle worker with a task.
+    while idleWorkers and (taskIdx < nTasks):
+        workerRank = idleWorkers.pop()
+        logger.debug(
+            "master %s: send task %d to rank %d", stageName, taskIdx, workerRank
         )
-        print(
-            " -k meta.json valid.kea toa.kea  -i ./RockallSentinel2B_20170816.txt -o ./Outputs"
+        mpiComm.send(
+            [stage, taskIdx, paramsLst[taskIdx]],
+            dest=workerRank,
+            tag=mpiTags.START,
         )
-    else:
+        taskIdx += 1
 
-        parser = argparse.ArgumentParser(
-            prog="arcsimpi.py",
-            formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-            description="""Software for the Atmospheric and Radiometric Correction of Satellite Imagery (ARCSI)""",
-            epilog="""Using 6S and rsgislib this software (ARCSI) provides a unified set of scripts for taking \'RAW\' digital numbers and converting them into radiance, top of atmosphere reflectance, surface reflectance using modelled atmosphere via 6S or undertaking a dark object subtraction. New sensors are easy to add so get in touch if we don't currently support the sensor you require.""",
+    # each DONE receipt frees its worker for the next pending task.
+    while completedTasks < nTasks:
+        rtnData = mpiComm.recv(
+            source=MPI.ANY_SOURCE, tag=mpiTags.DONE, status=mpiStatus
         )
+        workerRank = mpiStatus.Get_source()
+        doneTaskIdx, rtnParamsObj = rtnData
+        logger.debug(
+            "master %s: received task %d from rank %d",
+            stageName,
+            doneTaskIdx,
+            workerRank,
+        )
+        if isinstance(rtnParamsObj, Exception):
+            # A worker failed on this task; re-raise on the master so
+            # the normal error path reports it and EXITs the workers.
+            raise ARCSIException(str(rtnParamsObj))
+        paramsLstTmp[doneTaskIdx] = rtnParamsObj
+        completedTasks += 1
+        if taskIdx < nTasks:
+            logger.debug(
+                "master %s: send task %d to rank %d", stageName, taskIdx, workerRank
+            )
+            mpiComm.send(
+                [stage, taskIdx, paramsLst[taskIdx]],
+                dest=workerRank,
+                tag=mpiTags.START,
+            )
+            taskIdx += 1
+        else:
+            idleWorkers.add(workerRank)
+
+    return paramsLstTmp
+
+
+# Built once at import; printBanner emits it with a single write so the
+# banner cannot interleave with output from other ranks.
+ARCSI_BANNER = (
+    f"ARCSI {ARCSI_VERSION} Copyright (C) {ARCSI_COPYRIGHT_YEAR} "
+    f"{ARCSI_COPYRIGHT_NAMES}\n"
+    "This program comes with ABSOLUTELY NO WARRANTY.\n"
+    "This is free software, and you are welcome to redistribute it\n"
+    f"under certain conditions; See website ({ARCSI_WEBSITE}).\n"
+    f"Bugs are to be reported to {ARCSI_SUPPORT_EMAIL}.\n\n"
+)
+
+
+def printBanner():
+    sys.stdout.write(ARCSI_BANNER)
 
-        # Request the version number.
-        parser.add_argument(
-            "-v",
-            "--version",
+
+# Declarative specification of the arcsimpi command line arguments as
+# (flags, keyword arguments) pairs consumed by buildParser.
+ARG_SPEC = (
+    (
+        ("-v", "--version"),
+        dict(
             action="version",
             version="%(prog)s version " + ARCSI_VERSION,
-        )
-        # Define the argument to define the debug mode for arcsi.
-        parser.add_argument(
-            "--debug",
+        ),
+    ),
+    (
+        ("--debug",),
+        dict(
             action="store_true",
             default=False,
             help="""If defined the debug mode will be activated,
-                            therefore intermediate files will not be deleted.""",
-        )
-        parser.add_argument(
-            "-i",
-            "--inputheaders",
+                        therefore intermediate files will not be deleted.""",
+        ),
+    ),
+    (
+        ("-i", "--inputheaders"),
+        dict(
             type=str,
             help="""Specify the text file listing the image header files for the images to be processed.""",
-        )
-        # Define the argument for specifying the sensor.
-        parser.add_argument(
-            "-s",
-            "--sensor",
+        ),
+    ),
+    (
+        ("-s", "--sensor"),
+        dict(
             choices=ARCSI_SENSORS_LIST,
             help="""Specify the sensor being processed.""",
-        )
-        # Define the argument for requesting a list of the supported sensors.
-        parser.add_argument(
-            "--sensorlist",
+        ),
+    ),
+    (
+        ("--sensorlist",),
+        dict(
             action="store_true",
             default=False,
             help="""List the sensors which are supported and the require names.""",
-        )
-        # Define the argument for specifying the file path of the output images.
-        parser.add_argument(
-            "-o", "--outpath", type=str, help="""Specify the output file path."""
-        )
-        # Define the argument for specifying the file path of the output images.
-        parser.add_argument(
-            "-t",
-            "--tmpath",
+        ),
+    ),
+    (
+        ("-o", "--outpath"),
+        dict(
+            type=str,
+            help="""Specify the output file path.""",
+        ),
+    ),
+    (
+        ("-t", "--tmpath"),
+        dict(
             type=str,
             help="""Specify a tempory path for files to be written to temporarly 
-                    during processing if required (DDVAOT, DOS and CLOUDS).""",
-        )
-        # Define the argument which specifies the products which are to be generated.
-        parser.add_argument(
-            "-p",
-            "--prods",
+                during processing if required (DDVAOT, DOS and CLOUDS).""",
+        ),
+    ),
+    (
+        ("-p", "--prods"),
+        dict(
             type=str,
             nargs="+",
             choices=ARCSI_PRODUCTS_LIST,
             help="""Specify the output products which are to be
-                            calculated, as a comma separated list.""",
-        )
-        # Define the argument for requesting a list of products.
-        parser.add_argument(
-            "--prodlist",
+                        calculated, as a comma separated list.""",
+        ),
+    ),
+    (
+        ("--prodlist",),
+        dict(
             action="store_true",
             default=False,
             help="""List the products which are supported and
-                            their input requirements.""",
-        )
-        # Define the argument for specifying that statistics and pyramids should be built for
-        # all output images.
-        parser.add_argument(
-            "--stats",
+                        their input requirements.""",
+        ),
+    ),
+    (
+        ("--stats",),
+        dict(
             action="store_true",
             default=False,
             help="""Specifies that the image statistics and
-                            pyramids should be build for all output images.""",
-        )
-        parser.add_argument(
-            "-d",
-            "--dem",
+                        pyramids should be build for all output images.""",
+        ),
+    ),
+    (
+        ("-d", "--dem"),
+        dict(
             type=str,
             help="""Specify a DEM which is to be used for building
-                            an LUT and applying 6S coefficients with respect to elevation.""",
-        )
-        parser.add_argument(
-            "--demnodata",
+                        an LUT and applying 6S coefficients with respect to elevation.""",
+        ),
+    ),
+    (
+        ("--demnodata",),
+        dict(
             type=float,
             help="""Specify a no data value for the input DEM image file.""",
-        )
-        # Define the argument for specifying the output image base file name if it is
-        # not to be automatically generated.
-        parser.add_argument(
-            "--outbasename",
+        ),
+    ),
+    (
+        ("--outbasename",),
+        dict(
             type=str,
             help="""Specify the output file base name if it
-                            is not to be generated by the system.""",
-        )
-        # Define the argument for specifying the image file format.
-        parser.add_argument(
-            "-f",
-            "--format",
+                        is not to be generated by the system.""",
+        ),
+    ),
+    (
+        ("-f", "--format"),
+        dict(
             type=str,
             choices=ARCSI_GDALFORMATS_LIST,
             default="KEA",
             help="""Specify the image output format (Note. Current just the KEA file format is supported, 
-                            use gdal_translate to convert to other formats (e.g., GeoTIFF) following completion.).""",
-        )
-        # Define the argument stating that alongsided the masked products should none masked products.
-        parser.add_argument(
-            "--fullimgouts",
+                        use gdal_translate to convert to other formats (e.g., GeoTIFF) following completion.).""",
+        ),
+    ),
+    (
+        ("--fullimgouts",),
+        dict(
             action="store_true",
             default=False,
             help="""If set then alongside the masked outputs (e.g., clouds) then SREF (DOS and/or modelled) 
-                                    versions of the full images (i.e., without mask applied) will also be outputted.""",
-        )
-        # Define the argument for specifying the WKT projection file for the input file.
-        parser.add_argument(
-            "--inwkt",
+                                versions of the full images (i.e., without mask applied) will also be outputted.""",
+        ),
+    ),
+    (
+        ("--inwkt",),
+        dict(
             type=str,
             help="""Specify the WKT projection of the input image with projection defined with WKT file.""",
-        )
-        # Define the argument for specifying the WKT projection file for the outputs.
-        parser.add_argument(
-            "--outwkt",
+        ),
+    ),
+    (
+        ("--outwkt",),
+        dict(
             type=str,
             help="""Transform the outputs to the projection defined with WKT file.""",
-        )
-        # Define the argument for specifying the proj4 projection string for the outputs.
-        parser.add_argument(
-            "--outproj4",
+        ),
+    ),
+    (
+        ("--outproj4",),
+        dict(
             type=str,
             help="""Transform the outputs to the projection defined using a proj4 string and provided within a text file.""",
-        )
-        # Define the argument for string added to the output files names indicating the projection.
-        parser.add_argument(
-            "--projabbv",
+        ),
+    ),
+    (
+        ("--projabbv",),
+        dict(
             type=str,
             help="""Abbreviation or acronym for the project which will added to the file name.""",
-        )
-        # Define the argument for the output x pixel resolution (if image re-projected).
-        parser.add_argument(
-            "--ximgres",
+        ),
+    ),
+    (
+        ("--ximgres",),
+        dict(
             type=float,
             help="""Float for the output image pixel x resolution (if re-projected). 
-                                    Optional, if not provided the input image resolution is used.""",
-        )
-        # Define the argument for the output y pixel resolution (if image re-projected).
-        parser.add_argument(
-            "--yimgres",
+                                Optional, if not provided the input image resolution is used.""",
+        ),
+    ),
+    (
+        ("--yimgres",),
+        dict(
             type=float,
             help="""Float for the output image pixel y resolution (if re-projected). 
-                                    Optional, if not provided the input image resolution is used.""",
-        )
-        # Define the argument which specifies the standard aersol profile to use.
-        parser.add_argument(
-            "--aeropro",
+                                Optional, if not provided the input image resolution is used.""",
+        ),
+    ),
+    (
+        ("--aeropro",),
+        dict(
             type=str,
             choices=[
                 "NoAerosols",
@@ -284,11 +580,12 @@ if (__name__ == "__main__") and (mpiRank == 0):
                 "Stratospheric",
             ],
             help="""Specify the 6S defined aersol profile to use.
-                            (NoAerosols, Continental, Maritime, Urban, Desert, BiomassBurning, Stratospheric)""",
-        )
-        # Define the argument which specifies the standard atompheric profile to use.
-        parser.add_argument(
-            "--atmospro",
+                        (NoAerosols, Continental, Maritime, Urban, Desert, BiomassBurning, Stratospheric)""",
+        ),
+    ),
+    (
+        ("--atmospro",),
+        dict(
             type=str,
             choices=[
                 "NoGaseousAbsorption",
@@ -300,167 +597,195 @@ if (__name__ == "__main__") and (mpiRank == 0):
                 "USStandard1962",
             ],
             help="""Specify the 6S defined atmospheric profile to use.
-                            (NoGaseousAbsorption, Tropical, MidlatitudeSummer, MidlatitudeWinter,
-                            SubarcticSummer, SubarcticWinter, USStandard1962)""",
-        )
-        # Define the argument for specifying the file path for the image specifying the generic aerosol model.
-        parser.add_argument(
-            "--aeroimg", type=str, help="""Specify the aerosol model image file path."""
-        )
-        # Define the argument for specifying the file path for the image specifying the generic atmosphere model.
-        parser.add_argument(
-            "--atmosimg",
+                        (NoGaseousAbsorption, Tropical, MidlatitudeSummer, MidlatitudeWinter,
+                        SubarcticSummer, SubarcticWinter, USStandard1962)""",
+        ),
+    ),
+    (
+        ("--aeroimg",),
+        dict(
+            type=str,
+            help="""Specify the aerosol model image file path.""",
+        ),
+    ),
+    (
+        ("--atmosimg",),
+        dict(
             type=str,
             help="""Specify the atmosphere model image file path.""",
-        )
-        # Define the argument which specifies the amount of OZone in atmosphere
-        parser.add_argument(
-            "--atmosozone",
+        ),
+    ),
+    (
+        ("--atmosozone",),
+        dict(
             type=float,
             help="""Specify the total amount of ozone in a vertical path
-                            through the atmosphere (in cm-atm)""",
-        )
-        # Define the argument which specifies the amount of water in the atmosphere
-        parser.add_argument(
-            "--atmoswater",
+                        through the atmosphere (in cm-atm)""",
+        ),
+    ),
+    (
+        ("--atmoswater",),
+        dict(
             type=float,
             help="""Specify the  total amount of water in a vertical path
-                            through the atmosphere (in g/cm^2)""",
-        )
-        # Define the argument which specifies the proportion of water-like aerosols
-        parser.add_argument(
-            "--aerowater",
+                        through the atmosphere (in g/cm^2)""",
+        ),
+    ),
+    (
+        ("--aerowater",),
+        dict(
             type=float,
             help="""Specify the proportion of water-like aerosols
-                            (water, dust, oceanic and soot proportions must add up
-                            to 1 although all do not been to be specified).""",
-        )
-        # Define the argument which specifies the proportion of dust-like aerosols
-        parser.add_argument(
-            "--aerodust",
+                        (water, dust, oceanic and soot proportions must add up
+                        to 1 although all do not been to be specified).""",
+        ),
+    ),
+    (
+        ("--aerodust",),
+        dict(
             type=float,
             help="""Specify the proportion of dust-like aerosols
-                            (water, dust, oceanic and soot proportions must add up
-                            to 1 although all do not been to be specified).""",
-        )
-        # Define the argument which specifies the proportion of oceanic-like aerosols
-        parser.add_argument(
-            "--aerooceanic",
+                        (water, dust, oceanic and soot proportions must add up
+                        to 1 although all do not been to be specified).""",
+        ),
+    ),
+    (
+        ("--aerooceanic",),
+        dict(
             type=float,
             help="""Specify the proportion of oceanic-like aerosols
-                            (water, dust, oceanic and soot proportions must add up
-                            to 1 although all do not been to be specified).""",
-        )
-        # Define the argument which specifies the proportion of soot-like aerosols
-        parser.add_argument(
-            "--aerosoot",
+                        (water, dust, oceanic and soot proportions must add up
+                        to 1 although all do not been to be specified).""",
+        ),
+    ),
+    (
+        ("--aerosoot",),
+        dict(
             type=float,
             help="""Specify the proportion of soot-like aerosols
-                            (water, dust, oceanic and soot proportions must add up
-                            to 1 although all do not been to be specified).""",
-        )
-        # Define the argument which specifies the ground reflectance.
-        parser.add_argument(
-            "--grdrefl",
+                        (water, dust, oceanic and soot proportions must add up
+                        to 1 although all do not been to be specified).""",
+        ),
+    ),
+    (
+        ("--grdrefl",),
+        dict(
             type=str,
             default="GreenVegetation",
             choices=["GreenVegetation", "ClearWater", "Sand", "LakeWater", "BRDFHapke"],
             help="""Specify the ground reflectance used for 
-            the 6S model. (GreenVegetation, ClearWater, Sand, LakeWater, BRDFHapke).""",
-        )
-        # Define the argument for specifying the surface elevation for the scene.
-        parser.add_argument(
-            "--surfacealtitude",
+        the 6S model. (GreenVegetation, ClearWater, Sand, LakeWater, BRDFHapke).""",
+        ),
+    ),
+    (
+        ("--surfacealtitude",),
+        dict(
             type=float,
             default="0",
             help="""Specify the altiude (in km) of the surface being sensed.""",
-        )
-        # Define the argument for specifying the AOT value for the scene
-        parser.add_argument(
-            "--aot",
+        ),
+    ),
+    (
+        ("--aot",),
+        dict(
             type=float,
             help="""Specifiy the AOT value for the scene.
-                                    If the AOT is specified the visability is ignored.""",
-        )
-        # Define the argument for specifying the visability value for the scene
-        parser.add_argument(
-            "--vis",
+                                If the AOT is specified the visability is ignored.""",
+        ),
+    ),
+    (
+        ("--vis",),
+        dict(
             type=float,
             help="""Specifiy the visibility value for the scene.
-                                    If the AOT is specified the visability is ignored.""",
-        )
-        # Define the argument for specifying the AOT value for the scene
-        parser.add_argument(
-            "--minaot",
+                                If the AOT is specified the visability is ignored.""",
+        ),
+    ),
+    (
+        ("--minaot",),
+        dict(
             type=float,
             default=0.05,
             help="""Specify the minimum AOT value within the search space
-                                    used to identify AOT values for the scene""",
-        )
-        # Define the argument for specifying the AOT value for the scene
-        parser.add_argument(
-            "--maxaot",
+                                used to identify AOT values for the scene""",
+        ),
+    ),
+    (
+        ("--maxaot",),
+        dict(
             type=float,
             default=0.5,
             help="""Specify the maximum AOT value within the search space
-                                    used to identify AOT values for the scene.""",
-        )
-        # Define the argument for specifying the AOT value for the scene
-        parser.add_argument(
-            "--lowaot",
+                                used to identify AOT values for the scene.""",
+        ),
+    ),
+    (
+        ("--lowaot",),
+        dict(
             type=float,
             default=0.1,
             help="""Specify the lower AOT amount to be removed from the AOT
-                                    estimate for defining --minaot within search space.""",
-        )
-        # Define the argument for specifying the AOT value for the scene
-        parser.add_argument(
-            "--upaot",
+                                estimate for defining --minaot within search space.""",
+        ),
+    ),
+    (
+        ("--upaot",),
+        dict(
             type=float,
             default=0.4,
             help="""Specify the upper AOT amount to be added to the AOT
-                                    estimate for defining --maxaot within search space.""",
-        )
-        # Define the argument for specifying the AOT image file for the scene
-        parser.add_argument(
-            "--aotfile",
+                                estimate for defining --maxaot within search space.""",
+        ),
+    ),
+    (
+        ("--aotfile",),
+        dict(
             type=str,
             help="""Specifiy an image file with AOT values for the
-                                    correction. An LUT for AOT and elevation will be generated.
-                                    Therefore, --dem needs to be provided alongside --aotfile.""",
-        )
-        parser.add_argument(
-            "--localdos",
+                                correction. An LUT for AOT and elevation will be generated.
+                                Therefore, --dem needs to be provided alongside --aotfile.""",
+        ),
+    ),
+    (
+        ("--localdos",),
+        dict(
             action="store_true",
             default=False,
             help="""Specifies that a local DOS should be applied
-                            rather than a global DOS.""",
-        )
-        parser.add_argument(
-            "--simpledos",
+                        rather than a global DOS.""",
+        ),
+    ),
+    (
+        ("--simpledos",),
+        dict(
             action="store_true",
             default=False,
             help="""Specifies that a simple (basic) DOS should be applied
-                            rather than the more complex variable global/local DOS methods.""",
-        )
-        parser.add_argument(
-            "--dosout",
+                        rather than the more complex variable global/local DOS methods.""",
+        ),
+    ),
+    (
+        ("--dosout",),
+        dict(
             type=float,
             default=20,
             help="""Specifies the reflectance value to which dark objects
-                            are set to during the dark object subtraction. The default is 20,
-                            which is equivalent to 2 percent reflectance.""",
-        )
-        parser.add_argument(
-            "--scalefac",
+                        are set to during the dark object subtraction. The default is 20,
+                        which is equivalent to 2 percent reflectance.""",
+        ),
+    ),
+    (
+        ("--scalefac",),
+        dict(
             type=int,
             default=1000,
             help="""Specifies the scale factor for the reflectance
-                            products.""",
-        )
-
-        parser.add_argument(
-            "--interp",
+                        products.""",
+        ),
+    ),
+    (
+        ("--interp",),
+        dict(
             type=str,
             default="cubic",
             choices=[
@@ -476,890 +801,573 @@ if (__name__ == "__main__") and (mpiRank == 0):
                 "med",
             ],
             help="""Specifies interpolation algorithm when reprojecting the imagery
-                                    (Note. the options are those in gdalwarp).""",
-        )
-
-        parser.add_argument(
-            "--interpresamp",
+                                (Note. the options are those in gdalwarp).""",
+        ),
+    ),
+    (
+        ("--interpresamp",),
+        dict(
             type=str,
             default="near",
             choices=["near", "bilinear", "cubic", "cubicspline", "lanczos", "average"],
             help="""Specifies interpolation algorithm when resampling image bands to a new resolution (e.g., Sentinel-2)
-                                    (Note. the options are those in gdalwarp).""",
-        )
-
-        parser.add_argument(
-            "--cloudmethods",
+                                (Note. the options are those in gdalwarp).""",
+        ),
+    ),
+    (
+        ("--cloudmethods",),
+        dict(
             type=str,
             default=None,
             choices=ARCSI_CLOUD_METHODS_LIST,
             help="""Specify the method(s) of cloud masking. Current Sentinel-2 and Landsat have options).
-                                Sentinel-2: FMASK, FMASK_DISP or S2CLOUDLESS. Landsat: FMASK or LSMSK, FMASK is current
-                                the default for both.""",
-        )
-
-        parser.add_argument(
-            "--cs_initdist",
+                            Sentinel-2: FMASK, FMASK_DISP or S2CLOUDLESS. Landsat: FMASK or LSMSK, FMASK is current
+                            the default for both.""",
+        ),
+    ),
+    (
+        ("--cs_initdist",),
+        dict(
             type=int,
             default=3000,
             help="""When clear-sky regions are being defined this parameter
-                                                   is the initial distance (m) from cloud objects to generate the initial
-                                                   clear-sky regions.""",
-        )
-        parser.add_argument(
-            "--cs_initminsize",
+                                               is the initial distance (m) from cloud objects to generate the initial
+                                               clear-sky regions.""",
+        ),
+    ),
+    (
+        ("--cs_initminsize",),
+        dict(
             type=int,
             default=3000,
             help="""When clear-sky regions are being defined this parameter
-                                                   is the minimum size (in pixels) of the initial objects.""",
-        )
-        parser.add_argument(
-            "--cs_finaldist",
+                                               is the minimum size (in pixels) of the initial objects.""",
+        ),
+    ),
+    (
+        ("--cs_finaldist",),
+        dict(
             type=int,
             default=1000,
             help="""When clear-sky regions are being defined this parameter
-                                                   is final distance (m) from the cloud objects defining clear sky
-                                                   regions.""",
-        )
-        parser.add_argument(
-            "--cs_morphop",
+                                               is final distance (m) from the cloud objects defining clear sky
+                                               regions.""",
+        ),
+    ),
+    (
+        ("--cs_morphop",),
+        dict(
             type=int,
             default=21,
             help="""When clear-sky regions are being defined this parameter
-                                                   is the size of the morphological opening operator used
-                                                   to finalise the result.""",
-        )
-        parser.add_argument(
-            "--checkouts",
+                                               is the size of the morphological opening operator used
+                                               to finalise the result.""",
+        ),
+    ),
+    (
+        ("--checkouts",),
+        dict(
             action="store_true",
             default=False,
             help="""Specifies that the output path should be checked for files with the same base name.
-                            If a file with the same base name is found then processing will not proceed - i.e., files will
-                            not be overwritten.""",
-        )
-        # Define the argument for requesting a list of the available environment variables.
-        parser.add_argument(
-            "--envvars",
+                        If a file with the same base name is found then processing will not proceed - i.e., files will
+                        not be overwritten.""",
+        ),
+    ),
+    (
+        ("--envvars",),
+        dict(
             action="store_true",
             default=False,
             help="""List the available environmental variables for ARCSI.""",
-        )
-        parser.add_argument(
-            "--resample2lowres",
+        ),
+    ),
+    (
+        ("--resample2lowres",),
+        dict(
             action="store_true",
             default=False,
             help="""If image data is provided at multiple image spatial resolutions then this
-                                    switch specifies that the higher resolution images should be resampled to the 
-                                    same resolution as the lower resolution images (Default: lower resolution are 
-                                    resampled to the higher resolution). Example, using this switch will mean Sentinel-2
-                                    imagery outputted at 20m rather than 10m resolution.""",
-        )
-        parser.add_argument(
-            "-k",
-            "--keepfileends",
+                                switch specifies that the higher resolution images should be resampled to the 
+                                same resolution as the lower resolution images (Default: lower resolution are 
+                                resampled to the higher resolution). Example, using this switch will mean Sentinel-2
+                                imagery outputted at 20m rather than 10m resolution.""",
+        ),
+    ),
+    (
+        ("-k", "--keepfileends"),
+        dict(
             type=str,
             nargs="+",
             default=None,
             help="""Provide a list of file endings which are to be kept following the completion of the processing.""",
-        )
-
-        parser.add_argument(
-            "--flatoutdir",
+        ),
+    ),
+    (
+        ("--flatoutdir",),
+        dict(
             action="store_true",
             default=False,
             help="""Do not create output directory for this image, 
-                        just output into the specified output directory""",
-        )
-
-        # Call the parser to parse the arguments.
-        args = parser.parse_args()
-
-        if args.sensorlist:
-            arcsilib.arcsirun.print2ConsoleListSensors()
-        elif args.prodlist:
-            arcsilib.arcsirun.print2ConsoleListProductDescription()
-        elif args.envvars:
-            arcsilib.arcsirun.print2ConsoleListEnvVars()
-        else:
-            # Check that the input header parameter has been specified.
-            if args.inputheaders == None:
-                print("Error: No list of input header files has been provided.\n")
-                sys.exit()
-
-            # Check that the senor parameter has been specified.
-            if args.sensor == None:
-                print("Error: No sensor has been provided.\n")
-                sys.exit()
-
-            # Check that the output image path has been specified.
-            if args.outpath == None:
-                # Print an error message if not and exit.
-                envVar = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_OUTPUT_PATH"
-                )
-                if envVar == None:
-                    print("Error: No output file path has been provided.\n")
-                    sys.exit()
-                else:
-                    print("Taking output file path from environment variable.")
-                    args.outpath = envVar
-
-            if not os.path.exists(args.outpath):
-                print("WARNING: Output directory does not exist so creating it...")
-                os.makedirs(args.outpath)
-            elif not os.path.isdir(args.outpath):
-                print("ERROR: Output Path exists but is not a directory...\n")
-                sys.exit()
-
-            if not args.outwkt is None:
-                if not os.path.exists(args.outwkt):
-                    print("Error: The output WKT file does not exist.\n")
-                    sys.exit()
-                elif args.projabbv == None:
-                    print(
-                        "WARNING: It is recommended that a projection abbreviation or acronym is provided (--projabbv)..."
-                    )
-
-            if not args.outproj4 is None:
-                if not os.path.exists(args.outproj4):
-                    print("Error: The output proj4 file does not exist.\n")
-                    sys.exit()
-                elif args.projabbv == None:
-                    print(
-                        "WARNING: It is recommended that a projection abbreviation or acronym is provided (--projabbv)..."
-                    )
-
-            needAOD = False
-            needAODMinMax = False
-            needTmp = False
-            needDEM = False
-            for prod in args.prods:
-                if prod == "DDVAOT":
-                    needAODMinMax = True
-                    needTmp = True
-                    needDEM = True
-                elif prod == "SREF":
-                    needAOD = True
-                elif prod == "DOS":
-                    if not args.simpledos:
-                        needTmp = True
-                elif prod == "CLOUDS":
-                    needTmp = True
-                elif prod == "DOSAOT":
-                    needAODMinMax = True
-                    needTmp = True
-                    needDEM = True
-                elif prod == "DOSAOTSGL":
-                    needAODMinMax = True
-                    needTmp = True
-                    needDEM = True
-                elif prod == "TOPOSHADOW":
-                    needTmp = True
-                    needDEM = True
-
-            if needAODMinMax and (args.minaot == None) and (args.maxaot == None):
-                envVarMinAOT = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_MIN_AOT"
-                )
-                if envVarMinAOT == None:
-                    print(
-                        "Error: The min and max AOT values for the search should be specified.\n"
-                    )
-                    sys.exit()
-                else:
-                    print("Taking min AOT from environment variable.")
-                    args.minaot = float(envVarMinAOT)
-
-                envVarMaxAOT = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_MAX_AOT"
-                )
-                if envVarMaxAOT == None:
-                    print(
-                        "Error: The min and max AOT values for the search should be specified.\n"
-                    )
-                    sys.exit()
-                else:
-                    print("Taking max AOT from environment variable.")
-                    args.maxaot = float(envVarMaxAOT)
+                    just output into the specified output directory""",
+        ),
+    ),
+)
 
-            if args.lowaot is None:
-                envVarLowAOT = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_LOW_AOT"
-                )
-                if not envVarLowAOT is None:
-                    args.lowaot = float(envVarLowAOT)
 
-            if args.upaot is None:
-                envVarUpAOT = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_UP_AOT"
+@functools.lru_cache(maxsize=1)
+def buildParser():
+    """
+    Build the arcsimpi command line argument parser from ARG_SPEC.
+    Memoized so the help fast path and the main parse share a single
+    construction.
+    """
+    parser = argparse.ArgumentParser(
+        prog="arcsimpi.py",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="""Software for the Atmospheric and Radiometric Correction of Satellite Imagery (ARCSI)""",
+        epilog="""Using 6S and rsgislib this software (ARCSI) provides a unified set of scripts for taking \'RAW\' digital numbers and converting them into radiance, top of atmosphere reflectance, surface reflectance using modelled atmosphere via 6S or undertaking a dark object subtraction. New sensors are easy to add so get in touch if we don't currently support the sensor you require.""",
+    )
+    for argFlags, argKwargs in ARG_SPEC:
+        parser.add_argument(*argFlags, **argKwargs)
+    return parser
+
+
+if __name__ == "__main__":
+    if helpOnlyInvocation():
+        # Answer help / listing requests without initialising MPI; the
+        # processing modules are only imported where actually needed.
+        if launcherRank() == 0:
+            printBanner()
+            if len(sys.argv) == 1:
+                print("arcsimpi.py [options]")
+                print("help : arcsimpi.py --help")
+                print("  or : arcsimpi.py -h")
+                print("")
+                print(
+                    "Example: mpirun -np 2 arcsimpi.py -s sen2 -p TOA SHARP METADATA -f KEA --stats \\"
                 )
-                if not envVarUpAOT is None:
-                    args.upaot = float(envVarUpAOT)
-
-            if (
-                needAOD
-                and (args.aot == None)
-                and (args.vis == None)
-                and (not needAODMinMax)
-                and (not args.aotfile)
-            ):
                 print(
-                    "Error: Either the AOT or the Visability need to specified. Or --aotfile needs to be provided.\n"
+                    " -k meta.json valid.kea toa.kea  -i ./RockallSentinel2B_20170816.txt -o ./Outputs"
                 )
-                sys.exit()
+            else:
+                args = buildParser().parse_args()
+                if args.sensorlist:
+                    import arcsilib.arcsirun
+
+                    arcsilib.arcsirun.print2ConsoleListSensors()
+                elif args.prodlist:
+                    import arcsilib.arcsirun
+
+                    arcsilib.arcsirun.print2ConsoleListProductDescription()
+                elif args.envvars:
+                    import arcsilib.arcsirun
+
+                    arcsilib.arcsirun.print2ConsoleListEnvVars()
+        sys.exit()
+
+    initMPI()
+
+    if mpiSize < 2:
+        if mpiRank == 0:
+            print(
+                "Error: arcsimpi.py needs at least 2 MPI processes (a master "
+                "plus one or more workers); run it via mpirun or srun, e.g. "
+                "mpirun -np 4 arcsimpi.py ...",
+                file=sys.stderr,
+            )
+        sys.exit(1)
 
-            if needTmp and args.tmpath == None:
-                envVar = rsgislib.tools.utils.get_environment_variable("ARCSI_TMP_PATH")
-                if envVar == None:
-                    print(
-                        "Error: If the DDVAOT, DOS, DOSAOTSGL, CLOUDS or TOPOSHADOW product is set then a tempory path needs to be provided.\n"
-                    )
-                    sys.exit()
-                else:
-                    print("Taking temp path from environment variable.")
-                    args.tmpath = envVar
+    logging.basicConfig(
+        level=logging.DEBUG if DEBUG else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
 
-            if needTmp:
-                if not os.path.exists(args.tmpath):
-                    print(
-                        "WARNING: The temp path specified does not exist, it is being created."
-                    )
-                    os.makedirs(args.tmpath)
-                if not os.path.isdir(args.tmpath):
-                    print(
-                        "Error: The temp path specified is not a directory, please correct and run again.\n"
-                    )
-                    sys.exit()
-
-            if args.dem == None:
-                envVar = rsgislib.tools.utils.get_environment_variable("ARCSI_DEM_PATH")
-                if not envVar == None:
-                    args.dem = envVar
-                    print("Taking DEM path from environment variable.")
-
-            if needDEM:
-                if (args.dem == None) or (not os.path.exists(args.dem)):
-                    print(
-                        "Error: A file path to a DEM has either not been specified or does exist, please check it and run again.\n"
-                    )
-                    sys.exit()
+    import rsgislib
 
-            if args.aeroimg == None:
-                envVar = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_AEROIMG_PATH"
-                )
-                if not envVar == None:
-                    args.aeroimg = envVar
-                    print(
-                        "Taking aerosol profile image path from environment variable."
-                    )
-                else:
-                    args.aeroimg = arcsilib.DEFAULT_ARCSI_AEROIMG_PATH
+    if mpiRank == 0:
+        printBanner()
+        parser = buildParser()
+        # Call the parser to parse the arguments.
+        args = parser.parse_args()
 
-            if args.atmosimg == None:
-                envVar = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_ATMOSIMG_PATH"
+        # Check that the input header parameter has been specified.
+        if args.inputheaders == None:
+            print("Error: No list of input header files has been provided.\n")
+            abortMPIJob()
+
+        # Check that the senor parameter has been specified.
+        if args.sensor == None:
+            print("Error: No sensor has been provided.\n")
+            abortMPIJob()
+
+        # Check that the output image path has been specified.
+        if args.outpath == None:
+            # Print an error message if not and exit.
+            envVar = _getEnvVar("ARCSI_OUTPUT_PATH")
+            if envVar == None:
+                print("Error: No output file path has been provided.\n")
+                abortMPIJob()
+            else:
+                print("Taking output file path from environment variable.")
+                args.outpath = envVar
+
+        outPathStat = _statPath(args.outpath)
+        if outPathStat is None:
+            print("WARNING: Output directory does not exist so creating it...")
+            os.makedirs(args.outpath)
+        elif not stat.S_ISDIR(outPathStat.st_mode):
+            print("ERROR: Output Path exists but is not a directory...\n")
+            abortMPIJob()
+
+        if not args.outwkt is None:
+            if not os.path.exists(args.outwkt):
+                print("Error: The output WKT file does not exist.\n")
+                abortMPIJob()
+            elif args.projabbv == None:
+                print(
+                    "WARNING: It is recommended that a projection abbreviation or acronym is provided (--projabbv)..."
                 )
-                if not envVar == None:
-                    args.atmosimg = envVar
-                    print(
-                        "Taking atmosphere profile image path from environment variable."
-                    )
-                else:
-                    args.atmosimg = arcsilib.DEFAULT_ARCSI_ATMOSIMG_PATH
 
-            if args.atmosimg == None:
-                envVar = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_ATMOSIMG_PATH"
-                )
-                if not envVar == None:
-                    args.atmosimg = envVar
-                    print(
-                        "Taking atmosphere profile image path from environment variable."
-                    )
-
-            if args.outwkt == None:
-                envVar = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_OUTPUT_WKT"
+        if not args.outproj4 is None:
+            if not os.path.exists(args.outproj4):
+                print("Error: The output proj4 file does not exist.\n")
+                abortMPIJob()
+            elif args.projabbv == None:
+                print(
+                    "WARNING: It is recommended that a projection abbreviation or acronym is provided (--projabbv)..."
                 )
-                if not envVar == None:
-                    args.outwkt = envVar
-                    print("Taking output WKT file from environment variable.")
 
-            if args.outproj4 == None:
-                envVar = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_OUTPUT_PROJ4"
-                )
-                if not envVar == None:
-                    args.outproj4 = envVar
-                    print("Taking output proj4 file from environment variable.")
+        needAOD = False
+        needAODMinMax = False
+        needTmp = False
+        needDEM = False
+        for prod in args.prods:
+            prodNeedAOD, prodNeedAODMinMax, prodNeedTmp, prodNeedDEM = (
+                PROD_REQUIREMENTS.get(prod, (False, False, False, False))
+            )
+            if (prod == "DOS") and args.simpledos:
+                prodNeedTmp = False
+            needAOD = needAOD or prodNeedAOD
+            needAODMinMax = needAODMinMax or prodNeedAODMinMax
+            needTmp = needTmp or prodNeedTmp
+            needDEM = needDEM or prodNeedDEM
+
+        for argName, envVarName in AOT_ENV_DEFAULTS:
+            if getattr(args, argName) is None:
+                envVal = _getEnvVar(envVarName)
+                if envVal is not None:
+                    print("Taking {} from environment variable.".format(argName))
+                    setattr(args, argName, float(envVal))
+
+        if needAODMinMax and ((args.minaot == None) or (args.maxaot == None)):
+            print(
+                "Error: The min and max AOT values for the search should be specified.\n"
+            )
+            abortMPIJob()
+
+        if (
+            needAOD
+            and (args.aot == None)
+            and (args.vis == None)
+            and (not needAODMinMax)
+            and (not args.aotfile)
+        ):
+            print(
+                "Error: Either the AOT or the Visability need to specified. Or --aotfile needs to be provided.\n"
+            )
+            abortMPIJob()
 
-            if args.projabbv == None:
-                envVar = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_PROJ_ABBV"
+        if needTmp and args.tmpath == None:
+            envVar = _getEnvVar("ARCSI_TMP_PATH")
+            if envVar == None:
+                print(
+                    "Error: If the DDVAOT, DOS, DOSAOTSGL, CLOUDS or TOPOSHADOW product is set then a tempory path needs to be provided.\n"
                 )
-                if not envVar == None:
-                    args.projabbv = envVar
-                    print("Taking projection abbreviation from environment variable.")
+                abortMPIJob()
+            else:
+                print("Taking temp path from environment variable.")
+                args.tmpath = envVar
 
-            atmosOZoneWaterSpecified = False
-            if (not args.atmosozone == None) and (args.atmoswater == None):
+        if needTmp:
+            tmpPathStat = _statPath(args.tmpath)
+            if tmpPathStat is None:
                 print(
-                    "Error: If the atmospheric ozone is defined then the atmospheric water needs to be specfied --atmoswater.\n"
+                    "WARNING: The temp path specified does not exist, it is being created."
                 )
-                sys.exit()
-            elif (not args.atmoswater == None) and (args.atmosozone == None):
+                os.makedirs(args.tmpath)
+            elif not stat.S_ISDIR(tmpPathStat.st_mode):
                 print(
-                    "Error: If the atmospheric water is defined then the atmospheric ozone needs to be specfied --atmosozone.\n"
+                    "Error: The temp path specified is not a directory, please correct and run again.\n"
                 )
-                sys.exit()
-            elif (not args.atmoswater == None) and (not args.atmosozone == None):
-                atmosOZoneWaterSpecified = True
-
-            aeroComponentsSpecified = False
-            if (
-                (not args.aerowater == None)
-                or (not args.aerodust == None)
-                or (not args.aerooceanic == None)
-                or (not args.aerosoot == None)
-            ):
-                aeroComponentsSpecified = True
-
-            if args.dosout == None:
-                envVar = rsgislib.tools.utils.get_environment_variable(
-                    "ARCSI_OUTDOS_REFL"
-                )
-                if not envVar == None:
-                    args.dosout = envVar
-                    print("Taking output DOS reflectance from environment variable.")
+                abortMPIJob()
 
-            envVar = rsgislib.tools.utils.get_environment_variable("ARCSI_USE_LOCALDOS")
+        if args.dem == None:
+            envVar = _getEnvVar("ARCSI_DEM_PATH")
             if not envVar == None:
-                if envVar == "TRUE":
-                    args.localdos = True
-                    print("Using local DOS method due to environment variable.")
-                else:
-                    args.localdos = False
-                    print("Using global DOS method due to environment variable.")
+                args.dem = envVar
+                print("Taking DEM path from environment variable.")
 
-            envVar = rsgislib.tools.utils.get_environment_variable(
-                "ARCSI_USE_SIMPLEDOS"
-            )
-            if not envVar == None:
-                if envVar == "TRUE":
-                    args.simpledos = True
-                    print("Using simple DOS method due to environment variable.")
-                else:
-                    args.simpledos = False
-                    print("Not using simple DOS method due to environment variable.")
+        if needDEM:
+            if (args.dem == None) or (_statPath(args.dem) is None):
+                print(
+                    "Error: A file path to a DEM has either not been specified or does exist, please check it and run again.\n"
+                )
+                abortMPIJob()
 
-            envVar = rsgislib.tools.utils.get_environment_variable("ARCSI_SCALE_FACTOR")
+        if args.aeroimg == None:
+            envVar = _getEnvVar("ARCSI_AEROIMG_PATH")
             if not envVar == None:
-                args.scalefac = int(envVar)
-
-            runTimer = rsgislib.RSGISTime()
-            runTimer.start(True)
+                args.aeroimg = envVar
+                print("Taking aerosol profile image path from environment variable.")
+            else:
+                args.aeroimg = DEFAULT_ARCSI_AEROIMG_PATH
 
-            try:
+        if args.atmosimg == None:
+            envVar = _getEnvVar("ARCSI_ATMOSIMG_PATH")
+            if not envVar == None:
+                args.atmosimg = envVar
+                print("Taking atmosphere profile image path from environment variable.")
+            else:
+                args.atmosimg = DEFAULT_ARCSI_ATMOSIMG_PATH
 
-                ######### Initialise and parameters object. #########
-                inputHeadersLst = rsgislib.tools.utils.read_text_file_to_list(
-                    args.inputheaders
-                )
-                paramsLst = []
-                calc6SSREF = False
-                exportMetaData = False
-                calcAOT = False
-                useAOTImage = False
-                first = True
-                for inputHeader in inputHeadersLst:
-                    paramsObj = arcsilib.arcsirun.prepParametersObj(
-                        inputHeader,
-                        None,
-                        None,
-                        args.sensor,
-                        args.inwkt,
-                        args.format,
-                        args.outpath,
-                        args.outbasename,
-                        args.outwkt,
-                        args.outproj4,
-                        args.projabbv,
-                        args.ximgres,
-                        args.yimgres,
-                        args.prods,
-                        args.stats,
-                        args.aeropro,
-                        args.atmospro,
-                        args.aeroimg,
-                        args.atmosimg,
-                        args.grdrefl,
-                        args.surfacealtitude,
-                        args.atmosozone,
-                        args.atmoswater,
-                        atmosOZoneWaterSpecified,
-                        args.aerowater,
-                        args.aerodust,
-                        args.aerooceanic,
-                        args.aerosoot,
-                        aeroComponentsSpecified,
-                        args.aot,
-                        args.vis,
-                        args.tmpath,
-                        args.minaot,
-                        args.maxaot,
-                        args.lowaot,
-                        args.upaot,
-                        args.dem,
-                        args.demnodata,
-                        args.aotfile,
-                        (not args.localdos),
-                        args.dosout,
-                        args.simpledos,
-                        args.debug,
-                        args.scalefac,
-                        args.interp,
-                        args.interpresamp,
-                        args.cs_initdist,
-                        args.cs_initminsize,
-                        args.cs_finaldist,
-                        args.cs_morphop,
-                        args.fullimgouts,
-                        args.checkouts,
-                        args.resample2lowres,
-                        args.keepfileends,
-                        args.cloudmethods,
-                        args.flatoutdir,
-                    )
-                    paramsLst.append(paramsObj)
-                    if first:
-                        if (
-                            paramsObj.prodsToCalc["DDVAOT"]
-                            or paramsObj.prodsToCalc["DOSAOT"]
-                            or paramsObj.prodsToCalc["DOSAOTSGL"]
-                        ):
-                            calcAOT = True
-                            if (
-                                paramsObj.prodsToCalc["DDVAOT"]
-                                or paramsObj.prodsToCalc["DOSAOT"]
-                            ):
-                                useAOTImage = True
-                        if paramsObj.prodsToCalc["SREF"]:
-                            calc6SSREF = True
-                        if paramsObj.prodsToCalc["METADATA"]:
-                            exportMetaData = True
-                        first = False
-                ##############################
+        if args.outwkt == None:
+            envVar = _getEnvVar("ARCSI_OUTPUT_WKT")
+            if not envVar == None:
+                args.outwkt = envVar
+                print("Taking output WKT file from environment variable.")
 
-                ######### RUN PART 1 #########
-                paramsLstTmp = []
-                nTasks = len(paramsLst)
-                taskIdx = 0
-                nWorkers = mpiSize - 1
-                completedTasks = 0
+        if args.outproj4 == None:
+            envVar = _getEnvVar("ARCSI_OUTPUT_PROJ4")
+            if not envVar == None:
+                args.outproj4 = envVar
+                print("Taking output proj4 file from environment variable.")
 
-                # MPI ranks must equal number of granules being processed
-                # get READY status from workers
-                for item in range(1, mpiSize):
+        if args.projabbv == None:
+            envVar = _getEnvVar("ARCSI_PROJ_ABBV")
+            if not envVar == None:
+                args.projabbv = envVar
+                print("Taking projection abbreviation from environment variable.")
 
-                    # receive the ready status from worker
-                    rtnParamsObj = mpiComm.recv(
-                        source=item, tag=mpiTags.READY, status=mpiStatus
-                    )
+        atmosOZoneWaterSpecified = False
+        if (not args.atmosozone == None) and (args.atmoswater == None):
+            print(
+                "Error: If the atmospheric ozone is defined then the atmospheric water needs to be specfied --atmoswater.\n"
+            )
+            abortMPIJob()
+        elif (not args.atmoswater == None) and (args.atmosozone == None):
+            print(
+                "Error: If the atmospheric water is defined then the atmospheric ozone needs to be specfied --atmosozone.\n"
+            )
+            abortMPIJob()
+        elif (not args.atmoswater == None) and (not args.atmosozone == None):
+            atmosOZoneWaterSpecified = True
+
+        aeroComponentsSpecified = False
+        if (
+            (not args.aerowater == None)
+            or (not args.aerodust == None)
+            or (not args.aerooceanic == None)
+            or (not args.aerosoot == None)
+        ):
+            aeroComponentsSpecified = True
+
+        if args.dosout == None:
+            envVar = _getEnvVar("ARCSI_OUTDOS_REFL")
+            if not envVar == None:
+                args.dosout = envVar
+                print("Taking output DOS reflectance from environment variable.")
+
+        envVar = _getEnvVar("ARCSI_USE_LOCALDOS")
+        if not envVar == None:
+            if envVar == "TRUE":
+                args.localdos = True
+                print("Using local DOS method due to environment variable.")
+            else:
+                args.localdos = False
+                print("Using global DOS method due to environment variable.")
+
+        envVar = _getEnvVar("ARCSI_USE_SIMPLEDOS")
+        if not envVar == None:
+            if envVar == "TRUE":
+                args.simpledos = True
+                print("Using simple DOS method due to environment variable.")
+            else:
+                args.simpledos = False
+                print("Not using simple DOS method due to environment variable.")
 
-                    if DEBUG:
-                        print(
-                            "DEBUG-master PART 1 || send to rank:",
-                            item,
-                            "time:",
-                            time.asctime(),
-                            "from node:",
-                            MPI.Get_processor_name(),
-                            "from rank",
-                            mpiRank,
-                            flush=True,
-                        )
+        envVar = _getEnvVar("ARCSI_SCALE_FACTOR")
+        if not envVar == None:
+            args.scalefac = int(envVar)
 
-                    mpiComm.send(
-                        [arcsiStages.ARCSIPART1, paramsLst[item - 1]],
-                        dest=item,
-                        tag=mpiTags.START,
+        # Carry the derived flags on the namespace so the workers can
+        # bind prepParametersObj without re-deriving them.
+        args.atmosOZoneWaterSpecified = atmosOZoneWaterSpecified
+        args.aeroComponentsSpecified = aeroComponentsSpecified
+    else:
+        args = None
+
+    # Rank 0 parses and validates the arguments once; broadcast the
+    # resulting namespace so worker ranks do not each rebuild the parser
+    # or repeat the environment variable / filesystem checks.
+    args = mpiComm.bcast(args, root=0)
+
+    if mpiRank == 0:
+        runTimer = rsgislib.RSGISTime()
+        runTimer.start(True)
+
+        try:
+
+            ######### Initialise and parameters object. #########
+            # Read the header list once on rank 0 - the work items are
+            # distributed to the workers from here so no other rank needs
+            # to touch the file.
+            with open(args.inputheaders, "r", buffering=1 << 20) as inHeadersFile:
+                inputHeadersLst = [
+                    line.strip() for line in inHeadersFile if line.strip()
+                ]
+            if not inputHeadersLst:
+                raise ARCSIException(
+                    "No input header files were listed within: " + args.inputheaders
+                )
+            # Building the parameter objects parses each scene header so
+            # it is distributed over the workers like any other stage.
+            paramsLst = runStageMaster(arcsiStages.ARCSIPREP, "PREP", inputHeadersLst)
+            calc6SSREF = False
+            exportMetaData = False
+            calcAOT = False
+            useAOTImage = False
+            if paramsLst:
+                paramsObj = paramsLst[0]
+                if (
+                    paramsObj.prodsToCalc["DDVAOT"]
+                    or paramsObj.prodsToCalc["DOSAOT"]
+                    or paramsObj.prodsToCalc["DOSAOTSGL"]
+                ):
+                    calcAOT = True
+                    if (
+                        paramsObj.prodsToCalc["DDVAOT"]
+                        or paramsObj.prodsToCalc["DOSAOT"]
+                    ):
+                        useAOTImage = True
+                if paramsObj.prodsToCalc["SREF"]:
+                    calc6SSREF = True
+                if paramsObj.prodsToCalc["METADATA"]:
+                    exportMetaData = True
+            ##############################
+
+            ######### RUN PART 1 #########
+            paramsLst = runStageMaster(arcsiStages.ARCSIPART1, "PART 1", paramsLst)
+            ##############################
+
+            ######### RUN PART 2 #########
+            if calcAOT:
+                if useAOTImage:
+                    raise ARCSIException(
+                        "Currently the --multi option does not support the merging of AOT images (i.e., from DDVAOT and DOSAOT) across multiple scenes."
                     )
-
-                # get DONE status from workers
-                for item in range(1, mpiSize):
-
-                    # receive the ready status to unblock the worker
-                    rtnParamsObj = mpiComm.recv(
-                        source=item, tag=mpiTags.DONE, status=mpiStatus
+                else:
+                    import numpy
+
+                    # Replace the AOT value with the mean from all the scenes.
+                    aotVals = numpy.fromiter(
+                        (
+                            paramsObj.aotVal
+                            for paramsObj in paramsLst
+                            if paramsObj.aotVal is not None
+                        ),
+                        dtype=numpy.float64,
                     )
-
-                    if DEBUG:
-                        print(
-                            "DEBUG-master PART 1 || receive from",
-                            item,
-                            "time:",
-                            time.asctime(),
-                            flush=True,
-                        )
-
-                    paramsLstTmp.append(rtnParamsObj)
-
-                paramsLst = paramsLstTmp
-
-                # force synchronise
-                mpiComm.Barrier()
-                ##############################
-
-                ######### RUN PART 2 #########
-                if calcAOT:
-                    if useAOTImage:
-                        raise ARCSIException(
-                            "Currently the --multi option does not support the merging of AOT images (i.e., from DDVAOT and DOSAOT) across multiple scenes."
-                        )
+                    if aotVals.size > 0:
+                        avgAOT = float(aotVals.mean())
                     else:
-                        # Replace the AOT value with the mean from all the scenes.
-                        aotSum = 0.0
-                        aotN = 0.0
-                        for paramsObj in paramsLst:
-                            if paramsObj.aotVal is not None:
-                                aotSum = aotSum + paramsObj.aotVal
-                                aotN = aotN + 1
-                        if aotN > 0:
-                            avgAOT = aotSum / aotN
-                        else:
-                            avgAOT = 0.05
-                        for params in paramsLst:
-                            paramsObj.aotVal = avgAOT
-
-                if calc6SSREF:
-                    paramsLstTmp = []
-                    nTasks = len(paramsLst)
-                    taskIdx = 0
-                    nWorkers = mpiSize - 1
-                    completedTasks = 0
-
-                    # MPI ranks must equal number of granules being processed
-                    # get READY status from workers
-                    for item in range(1, mpiSize):
-
-                        # receive the ready status from worker
-                        rtnParamsObj = mpiComm.recv(
-                            source=item, tag=mpiTags.READY, status=mpiStatus
-                        )
-
-                        if DEBUG:
-                            print(
-                                "DEBUG-master PART 2 || send to rank:",
-                                item,
-                                "time:",
-                                time.asctime(),
-                                "from node:",
-                                MPI.Get_processor_name(),
-                                "from rank",
-                                mpiRank,
-                                flush=True,
-                            )
-
-                        mpiComm.send(
-                            [arcsiStages.ARCSIPART2, paramsLst[item - 1]],
-                            dest=item,
-                            tag=mpiTags.START,
-                        )
-
-                    # get DONE status from workers
-                    for item in range(1, mpiSize):
-
-                        # receive the ready status to unblock the worker
-                        rtnParamsObj = mpiComm.recv(
-                            source=item, tag=mpiTags.DONE, status=mpiStatus
-                        )
-
-                        if DEBUG:
-                            print(
-                                "DEBUG-master PART 2 || receive from",
-                                item,
-                                "time:",
-                                time.asctime(),
-                                flush=True,
-                            )
-
-                        paramsLstTmp.append(rtnParamsObj)
-
-                    paramsLst = paramsLstTmp
-
-                    # force synchronise
-                    mpiComm.Barrier()
-                    ##############################
-
-                ######### RUN PART 3 #########
-                if exportMetaData:
-                    paramsLstTmp = []
-                    nTasks = len(paramsLst)
-                    taskIdx = 0
-                    nWorkers = mpiSize - 1
-                    completedTasks = 0
-
-                    # MPI ranks must equal number of granules being processed
-                    # get READY status from workers
-                    for item in range(1, mpiSize):
-
-                        # receive the ready status from worker
-                        rtnParamsObj = mpiComm.recv(
-                            source=item, tag=mpiTags.READY, status=mpiStatus
-                        )
-
-                        if DEBUG:
-                            print(
-                                "DEBUG-master PART 3 || send to rank:",
-                                item,
-                                "time:",
-                                time.asctime(),
-                                "from node:",
-                                MPI.Get_processor_name(),
-                                "from rank",
-                                mpiRank,
-                                flush=True,
-                            )
-
-                        mpiComm.send(
-                            [arcsiStages.ARCSIPART3, paramsLst[item - 1]],
-                            dest=item,
-                            tag=mpiTags.START,
-                        )
-
-                    # get DONE status from workers
-                    for item in range(1, mpiSize):
-
-                        # receive the ready status to unblock the worker
-                        rtnParamsObj = mpiComm.recv(
-                            source=item, tag=mpiTags.DONE, status=mpiStatus
-                        )
-
-                        if DEBUG:
-                            print(
-                                "DEBUG-master PART 3 || receive from",
-                                item,
-                                "time:",
-                                time.asctime(),
-                                flush=True,
-                            )
-
-                        paramsLstTmp.append(rtnParamsObj)
-
-                    paramsLst = paramsLstTmp
+                        avgAOT = 0.05
+                    for paramsObj in paramsLst:
+                        paramsObj.aotVal = avgAOT
 
-                    # force synchronise
-                    mpiComm.Barrier()
+            if calc6SSREF:
+                paramsLst = runStageMaster(arcsiStages.ARCSIPART2, "PART 2", paramsLst)
                 ##############################
 
-                ######### RUN PART 4 #########
-                paramsLstTmp = []
-                nTasks = len(paramsLst)
-                taskIdx = 0
-                nWorkers = mpiSize - 1
-                completedTasks = 0
-
-                # MPI ranks must equal number of granules being processed
-                # get READY status from workers
-                for item in range(1, mpiSize):
-
-                    # receive the ready status from worker
-                    rtnParamsObj = mpiComm.recv(
-                        source=item, tag=mpiTags.READY, status=mpiStatus
-                    )
-
-                    if DEBUG:
-                        print(
-                            "DEBUG-master PART 4 || send to rank:",
-                            item,
-                            "time:",
-                            time.asctime(),
-                            "from node:",
-                            MPI.Get_processor_name(),
-                            "from rank",
-                            mpiRank,
-                            flush=True,
-                        )
-
-                    mpiComm.send(
-                        [arcsiStages.ARCSIPART4, paramsLst[item - 1]],
-                        dest=item,
-                        tag=mpiTags.START,
-                    )
-
-                # get DONE status from workers
-                for item in range(1, mpiSize):
-
-                    # receive the ready status to unblock the worker
-                    rtnParamsObj = mpiComm.recv(
-                        source=item, tag=mpiTags.DONE, status=mpiStatus
-                    )
-
-                    if DEBUG:
-                        print(
-                            "DEBUG-master PART 4 || receive from",
-                            item,
-                            "time:",
-                            time.asctime(),
-                            flush=True,
+            ######### RUN PART 3 #########
+            if exportMetaData:
+                paramsLst = runStageMaster(arcsiStages.ARCSIPART3, "PART 3", paramsLst)
+            ##############################
+
+            ######### RUN PART 4 #########
+            paramsLst = runStageMaster(arcsiStages.ARCSIPART4, "PART 4", paramsLst)
+            ##############################
+
+            ######### KILL all workers #########
+            for workerID in range(mpiSize):
+                if workerID > 0:
+                    mpiComm.send(None, dest=workerID, tag=mpiTags.EXIT)
+            ##############################
+
+        except ARCSIException as e:
+            print("Error: {}".format(e), file=sys.stderr)
+            for workerID in range(mpiSize):
+                if workerID > 0:
+                    mpiComm.send(None, dest=workerID, tag=mpiTags.EXIT)
+            if args.debug:
+                raise
+        except Exception as e:
+            print("Error: {}".format(e), file=sys.stderr)
+            for workerID in range(mpiSize):
+                if workerID > 0:
+                    mpiComm.send(None, dest=workerID, tag=mpiTags.EXIT)
+            if args.debug:
+                raise
+
+        runTimer.end(True, "ARCSI took ", " to process. Thank you for using ARCSI.")
+        print("\n\n")
+    else:
+        # Worker processes execute code below
+        stageFuncs = {}
+        while True:
+            tskData = mpiComm.recv(source=0, tag=MPI.ANY_TAG, status=mpiStatus)
+            tag = mpiStatus.Get_tag()
+            paramsObj = None
+
+            if tag == mpiTags.START:
+                # Do work! The dispatch table is built lazily on the
+                # first task so idle ranks never import the processing
+                # modules or bind the prep arguments.
+                if not stageFuncs:
+                    arcsiRun = _getARCSIRun()
+                    stageFuncs = {
+                        arcsiStages.ARCSIPREP: _buildPrepFunc(
+                            args,
+                            args.atmosOZoneWaterSpecified,
+                            args.aeroComponentsSpecified,
+                        ),
+                        arcsiStages.ARCSIPART1: arcsiRun._runARCSIPart1,
+                        arcsiStages.ARCSIPART2: arcsiRun._runARCSIPart2,
+                        arcsiStages.ARCSIPART3: arcsiRun._runARCSIPart3,
+                        arcsiStages.ARCSIPART4: arcsiRun._runARCSIPart4,
+                    }
+                stageFunc = stageFuncs.get(tskData[0])
+                if stageFunc is None:
+                    raise ARCSIException("Don't recognise processing stage")
+                stageName = arcsiStages(tskData[0]).name
+                logger.debug(
+                    "worker %s START: node %s rank %d", stageName, mpiProcName, mpiRank
+                )
+                try:
+                    paramsObj = stageFunc(tskData[2])
+                except Exception as e:
+                    # Report the failure back to the master rather than
+                    # dying with a traceback while the master blocks in
+                    # its DONE receive; the master raises it from there.
+                    paramsObj = ARCSIException(
+                        "{} failed on rank {} ({}): {}".format(
+                            stageName, mpiRank, mpiProcName, e
                         )
-
-                    paramsLstTmp.append(rtnParamsObj)
-
-                paramsLst = paramsLstTmp
-
-                # force synchronise
-                mpiComm.Barrier()
-                ##############################
-
-                ######### KILL all workers #########
-                for workerID in range(mpiSize):
-                    if workerID > 0:
-                        mpiComm.send(None, dest=workerID, tag=mpiTags.EXIT)
-                ##############################
-
-            except ARCSIException as e:
-                print("Error: {}".format(e), file=sys.stderr)
-                for workerID in range(mpiSize):
-                    if workerID > 0:
-                        mpiComm.send(None, dest=workerID, tag=mpiTags.EXIT)
-                if args.debug:
-                    raise
-            except Exception as e:
-                print("Error: {}".format(e), file=sys.stderr)
-                for workerID in range(mpiSize):
-                    if workerID > 0:
-                        mpiComm.send(None, dest=workerID, tag=mpiTags.EXIT)
-                if args.debug:
-                    raise
-
-            runTimer.end(True, "ARCSI took ", " to process. Thank you for using ARCSI.")
-            print("\n\n")
-else:
-    # Worker processes execute code below
-    while True:
-        mpiComm.send(None, dest=0, tag=mpiTags.READY)
-        tskData = mpiComm.recv(source=0, tag=MPI.ANY_TAG, status=mpiStatus)
-        tag = mpiStatus.Get_tag()
-        paramsObj = None
-
-        if tag == mpiTags.START:
-            # Do work!
-            if tskData[0] == arcsiStages.ARCSIPART1:
-                if DEBUG:
-                    print(
-                        "DEBUG-worker PART 1 START ||",
-                        "time:",
-                        time.asctime(),
-                        "node:",
-                        MPI.Get_processor_name(),
-                        " my rank:",
-                        mpiRank,
-                        flush=True,
-                    )
-                paramsObj = arcsilib.arcsirun._runARCSIPart1(tskData[1])
-                if DEBUG:
-                    print(
-                        "DEBUG-worker PART 1 END ||",
-                        "time:",
-                        time.asctime(),
-                        "node:",
-                        MPI.Get_processor_name(),
-                        " my rank:",
-                        mpiRank,
-                        flush=True,
-                    )
-            elif tskData[0] == arcsiStages.ARCSIPART2:
-                if DEBUG:
-                    print(
-                        "DEBUG-worker PART 2 START ||",
-                        "time:",
-                        time.asctime(),
-                        "node:",
-                        MPI.Get_processor_name(),
-                        " my rank:",
-                        mpiRank,
-                        flush=True,
-                    )
-                paramsObj = arcsilib.arcsirun._runARCSIPart2(tskData[1])
-                if DEBUG:
-                    print(
-                        "DEBUG-worker PART 2 END ||",
-                        "time:",
-                        time.asctime(),
-                        "node:",
-                        MPI.Get_processor_name(),
-                        " my rank:",
-                        mpiRank,
-                        flush=True,
                     )
-            elif tskData[0] == arcsiStages.ARCSIPART3:
-                if DEBUG:
-                    print(
-                        "DEBUG-worker PART 3 START ||",
-                        "time:",
-                        time.asctime(),
-                        "node:",
-                        MPI.Get_processor_name(),
-                        " my rank:",
-                        mpiRank,
-                        flush=True,
-                    )
-                paramsObj = arcsilib.arcsirun._runARCSIPart3(tskData[1])
-                if DEBUG:
-                    print(
-                        "DEBUG-worker PART 3 END ||",
-                        "time:",
-                        time.asctime(),
-                        "node:",
-                        MPI.Get_processor_name(),
-                        " my rank:",
-                        mpiRank,
-                        flush=True,
-                    )
-            elif tskData[0] == arcsiStages.ARCSIPART4:
-                if DEBUG:
-                    print(
-                        "DEBUG-worker PART 4 START ||",
-                        "time:",
-                        time.asctime(),
-                        "node:",
-                        MPI.Get_processor_name(),
-                        " my rank:",
-                        mpiRank,
-                        flush=True,
-                    )
-                paramsObj = arcsilib.arcsirun._runARCSIPart4(tskData[1])
-                if DEBUG:
-                    print(
-                        "DEBUG-worker PART 4 END ||",
-                        "time:",
-                        time.asctime(),
-                        "node:",
-                        MPI.Get_processor_name(),
-                        " my rank:",
-                        mpiRank,
-                        flush=True,
-                    )
-            else:
-                raise ARCSIException("Don't recognise processing stage")
-            if DEBUG:
-                print(
-                    "DEBUG-worker arcsiPART",
-                    int(tskData[0]) + 1,
-                    "send to master || time:",
-                    time.asctime(),
-                    "node:",
-                    MPI.Get_processor_name(),
-                    " my rank:",
-                    mpiRank,
-                    flush=True,
+                logger.debug(
+                    "worker %s END: node %s rank %d", stageName, mpiProcName, mpiRank
                 )
-            mpiComm.send(paramsObj, dest=0, tag=mpiTags.DONE)
-
-        elif tag == mpiTags.EXIT:
-            break
-        mpiComm.Barrier()
+                mpiComm.send((tskData[1], paramsObj), dest=0, tag=mpiTags.DONE)
 
-    mpiComm.send(None, dest=0, tag=mpiTags.EXIT)
+            elif tag == mpiTags.EXIT:
+                break
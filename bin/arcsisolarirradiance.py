@@ -1826,7 +1826,7 @@ class ARCSISolarIrradiance(object):
     def run(self, inputFile, seperator, ignoreLines, wvCol, respCol, julianDay):
         solarSpec = self.getE490SolarSpectrum()
 
-        respFunc = arcsilib.arcsiutils.readSpectralResponseFunc(
+        respFunc = arcsilib.arcsiutils.readSpectralResponseFuncAoS(
             inputFile, seperator, ignoreLines, wvCol, respCol
         )
         irradiance = self.calcSolarIrradiance(solarSpec, respFunc, julianDay)
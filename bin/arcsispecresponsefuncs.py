@@ -65,53 +65,48 @@ class ARCSIResampleSpectralResponseFuncs(object):
         numOfSamples = int(math.ceil(float(rangeWv) / float(sampling))) + 1
 
         print("numOfSamples = ", numOfSamples)
-        try:
-            outFile = open(outputFile, "w")
-            resps = list()
-            wv = minWv
-            for i in range(numOfSamples):
-                line = "{0:f},".format(wv)  # str(wv) + str(",")
-
-                rfDist = 0
-                minDist = 0
-                minDistRF = None
-                minDistIdx = 0
-                first = True
-                for j in range(len(respFuncs)):
-                    rfDist = math.fabs(wv - respFuncs[j][0])
-                    if first:
+        outFile = open(outputFile, "w")
+        resps = list()
+        wv = minWv
+        for i in range(numOfSamples):
+            line = "{0:f},".format(wv)  # str(wv) + str(",")
+
+            rfDist = 0
+            minDist = 0
+            minDistRF = None
+            minDistIdx = 0
+            first = True
+            for j in range(len(respFuncs)):
+                rfDist = math.fabs(wv - respFuncs[j][0])
+                if first:
+                    minDist = rfDist
+                    minDistRF = respFuncs[j]
+                    minDistIdx = j
+                    first = False
+                else:
+                    if rfDist < minDist:
                         minDist = rfDist
                         minDistRF = respFuncs[j]
                         minDistIdx = j
-                        first = False
-                    else:
-                        if rfDist < minDist:
-                            minDist = rfDist
-                            minDistRF = respFuncs[j]
-                            minDistIdx = j
-                if method == "NearNeighbour":
-                    txt = "{0:f}".format(minDistRF[1])
-                    line = line + txt
-                    resps.append(minDistRF[1])
-                else:
-                    raise ARCSIException("Method of resampling is not reconised.")
+            if method == "NearNeighbour":
+                txt = "{0:f}".format(minDistRF[1])
+                line = line + txt
+                resps.append(minDistRF[1])
+            else:
+                raise ARCSIException("Method of resampling is not reconised.")
 
-                print(line)
-                line = line + str("\n")
-                outFile.write(line)
-                wv = wv + sampling
-
-            line = "\n"
-            for respVal in resps:
-                line = line + "{0:f},".format(respVal)
             print(line)
-            line = line + "\n"
+            line = line + str("\n")
             outFile.write(line)
-            outFile.close()
-        except ARCSIException as e:
-            raise e
-        except Exception as e:
-            raise e
+            wv = wv + sampling
+
+        line = "\n"
+        for respVal in resps:
+            line = line + "{0:f},".format(respVal)
+        print(line)
+        line = line + "\n"
+        outFile.write(line)
+        outFile.close()
 
     def run(
         self,
@@ -125,7 +120,7 @@ class ARCSIResampleSpectralResponseFuncs(object):
         method,
     ):
 
-        respFunc = arcsilib.arcsiutils.readSpectralResponseFunc(
+        respFunc = arcsilib.arcsiutils.readSpectralResponseFuncAoS(
             inputFile, seperator, ignoreLines, wvCol, respCol
         )
         print(respFunc)